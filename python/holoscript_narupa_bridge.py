@@ -4,33 +4,421 @@ Python bridge for spawning and controlling Narupa servers
 Communicates with HoloScript compiler via stdin/stdout JSON-RPC
 """
 
+import os
 import sys
+import time
+import queue
+import atexit
+import io
+import copy
+import gzip
 import json
+import pickle
+import hashlib
+import importlib
+import importlib.metadata
+import selectors
+import asyncio
 import argparse
+import functools
 import threading
+import concurrent.futures
 import signal
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, ClassVar, Dict, Any, List, Optional, Tuple, Union, cast
 import logging
+import logging.handlers
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.FileHandler('narupa_bridge.log'), logging.StreamHandler(sys.stderr)]
-)
+try:
+    import orjson
+except ImportError:  # stdlib fallback keeps the bridge usable without orjson
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec
+except ImportError:  # requests are then decoded with orjson/json and checked by hand
+    msgspec = None  # type: ignore[assignment]
+
+# Configure logging: records are queued on the calling thread and written to
+# the log file and stderr by a background listener, off the RPC path
+_log_queue: 'queue.Queue[logging.LogRecord]' = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers: List[logging.Handler] = [logging.FileHandler('narupa_bridge.log'), logging.StreamHandler(sys.stderr)]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.root.setLevel(logging.INFO)
+logging.root.addHandler(logging.handlers.QueueHandler(_log_queue))
 logger = logging.getLogger(__name__)
 
+# Initial size of the stdin read buffer in RPC mode; it doubles as needed
+INITIAL_READ_BUFFER_SIZE = 32768
+
+# Default cap on a single JSON-RPC message (--max-request-bytes)
+DEFAULT_MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+# Read-only RPC methods whose results are reused for RESPONSE_CACHE_TTL seconds
+CACHEABLE_METHODS = frozenset({'list_servers', 'get_status', 'ping'})
+RESPONSE_CACHE_TTL = 0.05
+RESPONSE_CACHE_MAX_ENTRIES = 256
+
+# MD steps run in OpenMM between published frames and shutdown checks
+DEFAULT_BATCH_STEPS = 1000
+
+# Upper bound on concurrently running Narupa servers per bridge
+DEFAULT_MAX_SERVERS = 16
+
+# Seconds shutdown_all waits for servers to close on the event loop
+SHUTDOWN_TIMEOUT = 10.0
+
+# On-disk cache of parsed PDB structures, shared across bridge restarts
+CACHE_DIR = Path(os.environ.get('HOLOSCRIPT_CACHE_DIR', Path.home() / '.cache' / 'holoscript'))
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode a JSON-RPC message, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode a JSON-RPC message to UTF-8 bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+# JSON-RPC params: by-name (object) or by-position (array)
+RpcParams = Union[Dict[str, Any], List[Any]]
+
+# Integer request ids must fit the 64-bit range orjson can encode
+INT64_MIN = -(2 ** 63)
+INT64_MAX = 2 ** 63 - 1
+
+
+class _RpcError(Exception):
+    """Request-level JSON-RPC error with its error code and request id, if known"""
+
+    def __init__(self, code: int, message: str, req_id: Any = None) -> None:
+        super().__init__(message)
+        self.code = code
+        self.req_id = req_id
+
+
+if msgspec is not None:
+    # JSON-RPC request, decoded and validated in one pass by msgspec. Built
+    # with defstruct() because the class only exists when msgspec does.
+    RpcRequest = msgspec.defstruct('RpcRequest', [
+        ('method', str),
+        ('params', RpcParams, {}),
+        ('id', Union[int, float, str, None], None),
+        ('jsonrpc', str, '2.0'),
+    ])
+    _request_decoder = msgspec.json.Decoder(RpcRequest)
+
+
+def _valid_id(req_id: Any) -> bool:
+    """Whether a JSON-RPC id is a string, a float or a 64-bit integer"""
+    if isinstance(req_id, bool):
+        return False
+    if isinstance(req_id, int):
+        return INT64_MIN <= req_id <= INT64_MAX
+    return isinstance(req_id, (float, str))
+
+
+def _request_id(request: Any) -> Any:
+    """The id of a decoded but invalid request, if it has a usable one"""
+    if not isinstance(request, dict):
+        return None
+    req_id = request.get('id')
+    return req_id if _valid_id(req_id) else None
+
+
+def _decode_request(line: bytes) -> Tuple[str, RpcParams, Any]:
+    """
+    Decode and validate a JSON-RPC request
+
+    Args:
+        line: Raw request bytes
+
+    Returns:
+        (method, params, id) tuple
+
+    Raises:
+        _RpcError: -32700 for malformed JSON, -32600 for an invalid request;
+            the latter carries the request id when one could be read
+    """
+    if msgspec is not None:
+        try:
+            request: Any = _request_decoder.decode(line)
+        except msgspec.ValidationError as e:
+            # Well-formed JSON, so the id can usually still be echoed to the caller
+            try:
+                req_id = _request_id(msgspec.json.decode(line))
+            except msgspec.DecodeError:
+                req_id = None
+            raise _RpcError(-32600, f'Invalid Request: {str(e)}', req_id)
+        except msgspec.DecodeError as e:
+            raise _RpcError(-32700, f'Parse error: {str(e)}')
+        if request.id is not None and not _valid_id(request.id):
+            raise _RpcError(-32600, 'Invalid Request: id must be a string, a number or null')
+        return request.method, request.params, request.id
+
+    try:
+        request = _json_loads(line)
+    except json.JSONDecodeError as e:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        raise _RpcError(-32700, f'Parse error: {str(e)}')
+
+    if not isinstance(request, dict):
+        raise _RpcError(-32600, 'Invalid Request: expected a JSON object')
+    method = request.get('method')
+    params = request.get('params', {})
+    if not isinstance(method, str):
+        raise _RpcError(-32600, 'Invalid Request: method must be a string', _request_id(request))
+    if not isinstance(params, (dict, list)):
+        raise _RpcError(-32600, 'Invalid Request: params must be an object or array', _request_id(request))
+    req_id = request.get('id')
+    if req_id is not None and not _valid_id(req_id):
+        raise _RpcError(-32600, 'Invalid Request: id must be a string, a number or null')
+    return method, params, req_id
+
+
+def _encode_response(response: Dict[str, Any]) -> bytes:
+    """
+    Encode a JSON-RPC response
+
+    A result that cannot be encoded (e.g. an integer beyond 64 bits under
+    orjson) is replaced by a -32603 error, so one bad response never ends
+    the bridge loop.
+    """
+    try:
+        return _json_dumps(response)
+    except (TypeError, ValueError) as e:
+        logger.error("Cannot encode response: %s", e)
+        return _json_dumps({
+            'jsonrpc': '2.0',
+            'id': _request_id(response),
+            'error': {'code': -32603, 'message': f'Internal error: {str(e)}'}
+        })
+
+
+def _file_sha1(path: Path) -> str:
+    """Hex SHA-1 digest of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _sdk_versions() -> str:
+    """OpenMM and nanover versions, so disk cache entries do not outlive an upgrade"""
+    versions = []
+    for module_name, dist_name in (('openmm', 'openmm'), ('nanover', 'nanover-server')):
+        try:
+            version = getattr(importlib.import_module(module_name), '__version__', None)
+            versions.append(version or importlib.metadata.version(dist_name))
+        except (ImportError, importlib.metadata.PackageNotFoundError):
+            versions.append('unknown')
+    return '-'.join(versions)
+
+
+def _content_length(headers: bytes) -> Optional[int]:
+    """Value of the Content-Length header in a header block, if valid"""
+    for header in headers.split(b"\r\n"):
+        name, _, value = header.partition(b":")
+        if name.strip().lower() == b"content-length" and value.strip().isdigit():
+            return int(value)
+    return None
+
+
+class _NdjsonFraming:
+    """Newline-delimited JSON-RPC messages, one per line"""
+
+    def __init__(self, max_message_bytes: int) -> None:
+        self.max_message_bytes = max_message_bytes
+        self._discarding = False
+
+    def split(self, buf: bytearray, end: int) -> Tuple[List[Optional[bytes]], int]:
+        """
+        Split complete messages out of buf[:end]
+
+        Args:
+            buf: Read buffer
+            end: Number of valid bytes in buf
+
+        Returns:
+            (messages, bytes consumed); a None message marks one that
+            exceeded max_message_bytes and was dropped
+        """
+        messages: List[Optional[bytes]] = []
+        pos = 0
+        while (newline := buf.find(b"\n", pos, end)) != -1:
+            if self._discarding:
+                # Tail of an oversized message that was already rejected
+                self._discarding = False
+            elif newline - pos > self.max_message_bytes:
+                messages.append(None)
+            else:
+                messages.append(bytes(buf[pos:newline]))
+            pos = newline + 1
+
+        if end - pos > self.max_message_bytes or self._discarding:
+            if not self._discarding:
+                messages.append(None)
+                self._discarding = True
+            pos = end
+
+        return messages, pos
+
+    def finish(self, buf: bytearray, end: int) -> List[Optional[bytes]]:
+        """Messages left in buf[:end] at EOF (a final line without newline)"""
+        if self._discarding or not end:
+            return []
+        return [bytes(buf[:end])]
+
+    @staticmethod
+    def frame(payload: bytes) -> bytes:
+        """Frame an encoded message as a single line"""
+        return payload + b"\n"
+
+
+class _ContentLengthFraming:
+    """
+    LSP-style Content-Length framed JSON-RPC messages
+
+    Each message is a 'Content-Length: N' header block terminated by a blank
+    line, followed by N bytes of JSON. Bodies are sliced out once all N bytes
+    have arrived, so large messages spanning many reads are decoded once.
+    Header blocks without a valid Content-Length are logged and skipped.
+    """
+
+    def __init__(self, max_message_bytes: int) -> None:
+        self.max_message_bytes = max_message_bytes
+        self._skip = 0
+
+    def split(self, buf: bytearray, end: int) -> Tuple[List[Optional[bytes]], int]:
+        """
+        Split complete messages out of buf[:end]
+
+        Args:
+            buf: Read buffer
+            end: Number of valid bytes in buf
+
+        Returns:
+            (messages, bytes consumed); a None message marks one that
+            exceeded max_message_bytes and was dropped
+        """
+        messages: List[Optional[bytes]] = []
+        pos = 0
+        while True:
+            if self._skip:
+                # Body of an oversized message that was already rejected
+                skipped = min(self._skip, end - pos)
+                self._skip -= skipped
+                pos += skipped
+                if self._skip:
+                    break
+
+            header_end = buf.find(b"\r\n\r\n", pos, end)
+            if header_end == -1:
+                if end - pos > self.max_message_bytes:
+                    logger.warning("Discarding oversized Content-Length header block")
+                    pos = end
+                break
+
+            body_start = header_end + 4
+            length = _content_length(bytes(buf[pos:header_end]))
+            if length is None:
+                logger.warning("Skipping message without valid Content-Length: %r", bytes(buf[pos:header_end]))
+                pos = body_start
+                continue
+
+            if length > self.max_message_bytes:
+                messages.append(None)
+                self._skip = length
+                pos = body_start
+                continue
+
+            if end - body_start < length:
+                break
+            messages.append(bytes(buf[body_start:body_start + length]))
+            pos = body_start + length
+
+        return messages, pos
+
+    def finish(self, buf: bytearray, end: int) -> List[Optional[bytes]]:
+        """Messages left in buf[:end] at EOF; a partial frame is dropped"""
+        return []
+
+    @staticmethod
+    def frame(payload: bytes) -> bytes:
+        """Frame an encoded message with an LSP-style Content-Length header"""
+        return b"Content-Length: %d\r\n\r\n" % len(payload) + payload
+
+
+# Wire framing name -> framing class
+FRAMINGS: Dict[str, Callable[[int], Union[_NdjsonFraming, _ContentLengthFraming]]] = {
+    'ndjson': _NdjsonFraming,
+    'content-length': _ContentLengthFraming,
+}
+
+
+def _require_server_id(params: RpcParams) -> int:
+    """Extract the server_id RPC parameter, raising if it is missing"""
+    server_id = params.get('server_id') if isinstance(params, dict) else None
+    if server_id is None:
+        raise ValueError('server_id parameter required')
+    return server_id
+
 
 class NarupaBridge:
     """Main bridge class for managing Narupa servers"""
 
-    def __init__(self):
+    # Parsed PDB structures shared by every bridge in the process, keyed by
+    # (realpath, mtime_ns, temperature, timestep) -> (topology, system,
+    # integrator, state). The system is stored without Narupa's IMD force.
+    _PDB_CACHE: ClassVar['OrderedDict[Tuple[Any, ...], Tuple[Any, Any, Any, Any]]'] = OrderedDict()
+    _PDB_CACHE_LOCK: ClassVar[threading.Lock] = threading.Lock()
+    PDB_CACHE_MAX_ENTRIES: ClassVar[int] = 8
+
+    def __init__(self, max_servers: int = DEFAULT_MAX_SERVERS) -> None:
         self.servers: Dict[int, Any] = {}
-        self.server_threads: Dict[int, threading.Thread] = {}
+        self.max_servers = max_servers
+        self.server_tasks: Dict[int, concurrent.futures.Future] = {}
         self.next_port = 38801
         self.shutdown_flag = threading.Event()
 
+        # One event loop, on its own thread, drives the MD loop of every server
+        self._loop = asyncio.new_event_loop()
+        # Blocking Narupa/OpenMM calls run on these workers, one per server
+        self._loop.set_default_executor(
+            concurrent.futures.ThreadPoolExecutor(max_workers=max_servers, thread_name_prefix='narupa-md')
+        )
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name='narupa-loop', daemon=True
+        )
+        self._loop_thread.start()
+
+        # Recent results of read-only RPC methods: (method, params) -> (time, result)
+        self._resp_cache: Dict[Tuple[Any, ...], Tuple[float, Dict[str, Any]]] = {}
+
+        # JSON-RPC method name -> handler taking the request params
+        self._dispatch: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+            'start_server': self.start_server,
+            'stop_server': lambda p: self.stop_server(_require_server_id(p)),
+            'get_status': lambda p: self.get_server_status(_require_server_id(p)),
+            'list_servers': lambda p: self.list_servers(),
+            'shutdown_all': lambda p: self.shutdown_all(),
+            'ping': lambda p: {'status': 'pong', 'version': '1.0.0'},
+        }
+
         # Try to import Narupa SDK
         try:
             from nanover.app import NanoverImdApplication
@@ -40,7 +428,7 @@ class NarupaBridge:
             self.narupa_available = True
             logger.info("Narupa SDK loaded successfully")
         except ImportError as e:
-            logger.warning(f"Narupa SDK not available: {e}. Running in stub mode.")
+            logger.warning("Narupa SDK not available: %s. Running in stub mode.", e)
             self.narupa_available = False
 
     def start_server(self, config: Dict[str, Any]) -> Dict[str, Any]:
@@ -55,6 +443,7 @@ class NarupaBridge:
                 - temperature: Simulation temperature in Kelvin (default: 300)
                 - timestep: Timestep in femtoseconds (default: 2.0)
                 - steps: Number of steps (optional, for finite sims)
+                - batch_steps: MD steps run per published frame (default: 1000)
 
         Returns:
             Result dict with status, pid, port, num_atoms
@@ -65,6 +454,10 @@ class NarupaBridge:
                 'error': 'Narupa SDK not installed. Install with: pip install nanover-server'
             }
 
+        active = sum(1 for task in self.server_tasks.values() if not task.done())
+        if active >= self.max_servers:
+            return {'status': 'error', 'error': 'server pool full'}
+
         pdb_path = config.get('pdb_path')
         if not pdb_path:
             return {'status': 'error', 'error': 'pdb_path is required'}
@@ -79,46 +472,25 @@ class NarupaBridge:
         temperature = config.get('temperature', 300)  # Kelvin
         timestep = config.get('timestep', 2.0)  # femtoseconds
         steps = config.get('steps', None)
+        batch_steps = config.get('batch_steps', DEFAULT_BATCH_STEPS)
+        if not isinstance(batch_steps, int) or batch_steps < 1:
+            return {'status': 'error', 'error': 'batch_steps must be a positive integer'}
 
         try:
-            # Create OpenMM simulation from PDB
-            logger.info(f"Loading PDB file: {pdb_path}")
-            simulation = self.OpenMMSimulation.from_pdb(
-                str(pdb_file),
-                temperature=temperature,
-                timestep=timestep
-            )
+            # Create OpenMM simulation from PDB (or a cached parse of it)
+            simulation = self._load_simulation(pdb_file, temperature, timestep)
 
             num_atoms = simulation.system.getNumParticles()
-            logger.info(f"Loaded {num_atoms} atoms from {pdb_file.name}")
+            logger.info("Loaded %s atoms from %s", num_atoms, pdb_file.name)
 
             # Create Narupa IMD application
             app = self.NanoverImdApplication.basic_server(simulation)
 
-            # Start server in background thread
-            def run_server():
-                try:
-                    logger.info(f"Starting Narupa server on port {port}")
-                    app.server.start_server(port=port, address="0.0.0.0")
-
-                    if steps:
-                        # Run finite simulation
-                        for _ in range(steps):
-                            if self.shutdown_flag.is_set():
-                                break
-                            app.run()
-                    else:
-                        # Run indefinitely
-                        while not self.shutdown_flag.is_set():
-                            app.run()
-
-                    logger.info(f"Server on port {port} shutting down")
-                    app.close()
-                except Exception as e:
-                    logger.error(f"Server error on port {port}: {e}")
-
-            thread = threading.Thread(target=run_server, daemon=True)
-            thread.start()
+            # Schedule the server's MD loop on the shared event loop
+            stop = threading.Event()
+            task = asyncio.run_coroutine_threadsafe(
+                self._run_server(app, simulation, stop, port, steps, batch_steps), self._loop
+            )
 
             # Store server reference
             server_id = port  # Use port as unique ID
@@ -127,9 +499,11 @@ class NarupaBridge:
                 'simulation': simulation,
                 'config': config,
                 'port': port,
-                'num_atoms': num_atoms
+                'num_atoms': num_atoms,
+                'stop': stop
             }
-            self.server_threads[server_id] = thread
+            self.server_tasks[server_id] = task
+            self._resp_cache.clear()
 
             self.next_port += 1
 
@@ -142,9 +516,198 @@ class NarupaBridge:
             }
 
         except Exception as e:
-            logger.error(f"Failed to start server: {e}")
+            logger.error("Failed to start server: %s", e)
             return {'status': 'error', 'error': str(e)}
 
+    async def _run_server(
+        self,
+        app: Any,
+        simulation: Any,
+        stop: threading.Event,
+        port: int,
+        steps: Optional[int],
+        batch_steps: int
+    ) -> None:
+        """
+        Serve a Narupa application and advance its simulation
+
+        Steps are run in batches through OpenMM's Simulation.step(), which
+        stays in compiled code for the whole batch; one frame is published
+        per batch. The event loop only schedules the servers: each batch runs
+        on an executor thread, and since OpenMM releases the GIL while
+        stepping, batches of different servers run in parallel. The app is
+        closed here once the loop ends, so a close never overlaps a batch.
+
+        Args:
+            app: NanoverImdApplication to serve
+            simulation: Narupa OpenMMSimulation served by app
+            stop: Set by stop_server to end the loop after the current batch
+            port: Port to bind the server to
+            steps: Number of steps to run, or None to run until stopped
+            batch_steps: Number of MD steps per batch
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            logger.info("Starting Narupa server on port %s", port)
+            await loop.run_in_executor(
+                None, functools.partial(app.server.start_server, port=port, address="0.0.0.0")
+            )
+
+            openmm_simulation = simulation.simulation
+            remaining = steps
+            while remaining is None or remaining > 0:
+                if stop.is_set() or self.shutdown_flag.is_set():
+                    break
+                batch = batch_steps if remaining is None else min(batch_steps, remaining)
+                await loop.run_in_executor(None, openmm_simulation.step, batch)
+                app.imd.publish_current_frame()
+                if remaining is not None:
+                    remaining -= batch
+
+            logger.info("Server on port %s shutting down", port)
+        except Exception as e:
+            logger.error("Server error on port %s: %s", port, e)
+        finally:
+            try:
+                app.close()
+            except Exception as e:
+                logger.error("Failed to close server on port %s: %s", port, e)
+
+    def _load_simulation(self, pdb_file: Path, temperature: float, timestep: float) -> Any:
+        """
+        Build an OpenMM simulation for a PDB file, reusing earlier parses
+
+        The first request for a structure goes through OpenMMSimulation.from_pdb;
+        its topology, system, integrator and initial state are then cached in
+        memory and on disk (see CACHE_DIR) so later sessions, including ones in
+        a restarted bridge, skip PDB parsing and force-field assignment. Sessions
+        built from the cache share its Topology, get their own copy of its
+        System and start from the same integrator settings, positions and
+        velocities as a fresh load.
+
+        Args:
+            pdb_file: Path to the PDB file
+            temperature: Simulation temperature in Kelvin
+            timestep: Timestep in femtoseconds
+
+        Returns:
+            Narupa OpenMMSimulation for a new, independent session
+        """
+        from openmm.app import Simulation
+
+        key = (os.path.realpath(pdb_file), os.stat(pdb_file).st_mtime_ns, temperature, timestep)
+
+        with self._PDB_CACHE_LOCK:
+            cached = self._PDB_CACHE.get(key)
+            if cached is not None:
+                self._PDB_CACHE.move_to_end(key)
+
+        if cached is None:
+            cache_key = f"{_file_sha1(pdb_file)}_{temperature}_{timestep}_{_sdk_versions()}"
+            cached = self._read_disk_cache(cache_key)
+
+            if cached is None:
+                logger.info("Loading PDB file: %s", pdb_file)
+                simulation = self.OpenMMSimulation.from_pdb(
+                    str(pdb_file),
+                    temperature=temperature,
+                    timestep=timestep
+                )
+                openmm_simulation = simulation.simulation
+                entry = (
+                    openmm_simulation.topology,
+                    self._system_without_imd_force(simulation),
+                    copy.deepcopy(openmm_simulation.integrator),
+                    openmm_simulation.context.getState(getPositions=True, getVelocities=True)
+                )
+                self._write_disk_cache(cache_key, entry)
+                self._remember_structure(key, entry)
+                return simulation
+
+            self._remember_structure(key, cached)
+
+        logger.info("Using cached structure for %s", pdb_file)
+        topology, system, integrator, state = cached
+        # The System cannot be shared between sessions: from_simulation adds an
+        # IMD force to the System it wraps and reinitializes the Context
+        openmm_simulation = Simulation(topology, copy.deepcopy(system), copy.deepcopy(integrator))
+        openmm_simulation.context.setState(state)
+        return self.OpenMMSimulation.from_simulation(openmm_simulation)
+
+    @staticmethod
+    def _system_without_imd_force(simulation: Any) -> Any:
+        """
+        Copy a Narupa simulation's System, minus the IMD force Narupa added
+
+        Args:
+            simulation: Narupa OpenMMSimulation
+
+        Returns:
+            OpenMM System as force-field assignment produced it
+        """
+        system = copy.deepcopy(simulation.system)
+        imd_force = getattr(simulation, 'imd_force', None)
+        # The wrapper appends its IMD force after force-field assignment
+        last = system.getNumForces() - 1
+        if imd_force is not None and last >= 0 and type(system.getForce(last)) is type(imd_force):
+            system.removeForce(last)
+        return system
+
+    def _remember_structure(self, key: Tuple[Any, ...], entry: Tuple[Any, Any, Any, Any]) -> None:
+        """Store a parsed structure in the in-memory LRU cache"""
+        with self._PDB_CACHE_LOCK:
+            self._PDB_CACHE[key] = entry
+            while len(self._PDB_CACHE) > self.PDB_CACHE_MAX_ENTRIES:
+                self._PDB_CACHE.popitem(last=False)
+
+    def _read_disk_cache(self, cache_key: str) -> Optional[Tuple[Any, Any, Any, Any]]:
+        """
+        Load a parsed structure written by _write_disk_cache
+
+        Args:
+            cache_key: Cache entry name (PDB SHA-1, temperature, timestep, SDK versions)
+
+        Returns:
+            (topology, system, integrator, state) tuple, or None on a miss
+        """
+        pickle_path = CACHE_DIR / f"{cache_key}.pkl.gz"
+        if not pickle_path.exists():
+            return None
+
+        try:
+            with gzip.open(pickle_path, 'rb') as f:
+                topology, system, integrator, state = pickle.load(f)
+        except Exception as e:
+            logger.warning("Ignoring unreadable structure cache %s: %s", pickle_path, e)
+            return None
+
+        return topology, system, integrator, state
+
+    def _write_disk_cache(self, cache_key: str, entry: Tuple[Any, Any, Any, Any]) -> None:
+        """
+        Persist a parsed structure under CACHE_DIR
+
+        The topology, system, integrator and initial state are pickled with
+        fast gzip compression, since this runs on the first start_server for
+        a structure. The entry is written to a temporary name and renamed into
+        place so readers never see a partial entry.
+
+        Args:
+            cache_key: Cache entry name (PDB SHA-1, temperature, timestep, SDK versions)
+            entry: (topology, system, integrator, state) tuple
+        """
+        pickle_path = CACHE_DIR / f"{cache_key}.pkl.gz"
+
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+            tmp_path = CACHE_DIR / f"{pickle_path.name}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, pickle_path)
+        except Exception as e:
+            logger.warning("Could not write structure cache %s: %s", pickle_path, e)
+
     def stop_server(self, server_id: int) -> Dict[str, Any]:
         """
         Stop a running Narupa server
@@ -159,23 +722,32 @@ class NarupaBridge:
             return {'status': 'error', 'error': f'Server {server_id} not found'}
 
         try:
-            server = self.servers[server_id]
-            app = server['app']
-
-            logger.info(f"Stopping server {server_id}")
-            app.close()
-
-            # Remove from registry
-            del self.servers[server_id]
-            if server_id in self.server_threads:
-                del self.server_threads[server_id]
-
+            logger.info("Stopping server %s", server_id)
+            self._stop(server_id)
             return {'status': 'success', 'server_id': server_id}
 
         except Exception as e:
-            logger.error(f"Failed to stop server {server_id}: {e}")
+            logger.error("Failed to stop server %s: %s", server_id, e)
             return {'status': 'error', 'error': str(e)}
 
+    def _stop(self, server_id: int) -> Optional[concurrent.futures.Future]:
+        """
+        Ask a server's MD loop to end and close its application
+
+        The loop finishes its current batch, then closes the application. That
+        is not awaited here, so the RPC thread never waits on MD work.
+
+        Args:
+            server_id: Server ID
+
+        Returns:
+            Future that completes once the application is closed
+        """
+        server = self.servers.pop(server_id)
+        server['stop'].set()
+        self._resp_cache.clear()
+        return self.server_tasks.pop(server_id, None)
+
     def get_server_status(self, server_id: int) -> Dict[str, Any]:
         """
         Get status of a server
@@ -190,10 +762,10 @@ class NarupaBridge:
             return {'status': 'not_found', 'server_id': server_id}
 
         server = self.servers[server_id]
-        thread = self.server_threads.get(server_id)
+        task = self.server_tasks.get(server_id)
 
         return {
-            'status': 'running' if thread and thread.is_alive() else 'stopped',
+            'status': 'running' if task and not task.done() else 'stopped',
             'server_id': server_id,
             'port': server['port'],
             'num_atoms': server['num_atoms'],
@@ -204,12 +776,12 @@ class NarupaBridge:
         """List all active servers"""
         servers = []
         for server_id, server in self.servers.items():
-            thread = self.server_threads.get(server_id)
+            task = self.server_tasks.get(server_id)
             servers.append({
                 'server_id': server_id,
                 'port': server['port'],
                 'num_atoms': server['num_atoms'],
-                'running': thread.is_alive() if thread else False
+                'running': not task.done() if task else False
             })
         return {'status': 'success', 'servers': servers}
 
@@ -218,13 +790,26 @@ class NarupaBridge:
         logger.info("Shutting down all servers")
         self.shutdown_flag.set()
 
+        closing = []
         for server_id in list(self.servers.keys()):
-            self.stop_server(server_id)
+            logger.info("Stopping server %s", server_id)
+            task = self._stop(server_id)
+            if task is not None:
+                closing.append(task)
+        self._resp_cache.clear()
+
+        # Every MD loop sees shutdown_flag after its current batch; wait a
+        # bounded time for the closes so a hung server cannot stall the caller
+        _, pending = concurrent.futures.wait(closing, timeout=SHUTDOWN_TIMEOUT)
+        if pending:
+            logger.warning("%d servers did not close within %ss", len(pending), SHUTDOWN_TIMEOUT)
 
         return {'status': 'success', 'message': 'All servers stopped'}
 
 
-def handle_rpc_request(bridge: NarupaBridge, request: Dict[str, Any]) -> Dict[str, Any]:
+def handle_rpc_request(
+    bridge: NarupaBridge, method: str, params: RpcParams, req_id: Any
+) -> Dict[str, Any]:
     """
     Handle JSON-RPC request from HoloScript compiler
 
@@ -237,41 +822,47 @@ def handle_rpc_request(bridge: NarupaBridge, request: Dict[str, Any]) -> Dict[st
 
     Args:
         bridge: NarupaBridge instance
-        request: JSON-RPC request object
+        method: JSON-RPC method name
+        params: JSON-RPC params object or array
+        req_id: JSON-RPC request id
 
     Returns:
         JSON-RPC response object
     """
-    method = request.get('method')
-    params = request.get('params', {})
-    req_id = request.get('id')
-
     try:
-        if method == 'start_server':
-            result = bridge.start_server(params)
-        elif method == 'stop_server':
-            server_id = params.get('server_id')
-            if server_id is None:
-                raise ValueError('server_id parameter required')
-            result = bridge.stop_server(server_id)
-        elif method == 'get_status':
-            server_id = params.get('server_id')
-            if server_id is None:
-                raise ValueError('server_id parameter required')
-            result = bridge.get_server_status(server_id)
-        elif method == 'list_servers':
-            result = bridge.list_servers()
-        elif method == 'shutdown_all':
-            result = bridge.shutdown_all()
-        elif method == 'ping':
-            result = {'status': 'pong', 'version': '1.0.0'}
-        else:
+        handler = bridge._dispatch.get(method)
+        if handler is None:
             return {
                 'jsonrpc': '2.0',
                 'id': req_id,
                 'error': {'code': -32601, 'message': f'Method not found: {method}'}
             }
 
+        # Read-only methods are served from a short-lived cache so polling
+        # clients do not rebuild the same result on every call
+        cache_key: Optional[Tuple[Any, ...]] = None
+        if method in CACHEABLE_METHODS:
+            try:
+                if isinstance(params, dict):
+                    cache_key = (method, frozenset(params.items()))
+                else:
+                    cache_key = (method, tuple(params))
+            except TypeError:
+                cache_key = None
+
+        if cache_key is None:
+            result = handler(params)
+        else:
+            now = time.monotonic()
+            cached = bridge._resp_cache.get(cache_key)
+            if cached is not None and now - cached[0] < RESPONSE_CACHE_TTL:
+                result = cached[1]
+            else:
+                result = handler(params)
+                if len(bridge._resp_cache) >= RESPONSE_CACHE_MAX_ENTRIES:
+                    bridge._resp_cache.clear()
+                bridge._resp_cache[cache_key] = (now, result)
+
         return {
             'jsonrpc': '2.0',
             'id': req_id,
@@ -279,7 +870,7 @@ def handle_rpc_request(bridge: NarupaBridge, request: Dict[str, Any]) -> Dict[st
         }
 
     except Exception as e:
-        logger.error(f"Error handling method {method}: {e}")
+        logger.error("Error handling method %s: %s", method, e)
         return {
             'jsonrpc': '2.0',
             'id': req_id,
@@ -287,11 +878,48 @@ def handle_rpc_request(bridge: NarupaBridge, request: Dict[str, Any]) -> Dict[st
         }
 
 
-def main():
+def handle_rpc_line(bridge: NarupaBridge, line: bytes) -> Optional[Dict[str, Any]]:
     """
-    Main entry point for stdin/stdout JSON-RPC communication
-    Reads JSON-RPC requests from stdin, processes them, writes responses to stdout
+    Decode one JSON-RPC message and dispatch it
+
+    Args:
+        bridge: NarupaBridge instance
+        line: Raw request bytes, without framing (newline or headers)
+
+    Returns:
+        JSON-RPC response object, or None for blank lines
     """
+    line = line.strip()
+    if not line:
+        return None
+
+    try:
+        method, params, req_id = _decode_request(line)
+        return handle_rpc_request(bridge, method, params, req_id)
+
+    except _RpcError as e:
+        return {
+            'jsonrpc': '2.0',
+            'id': e.req_id,
+            'error': {
+                'code': e.code,
+                'message': str(e)
+            }
+        }
+    except Exception as e:
+        logger.error("Unexpected error: %s", e)
+        return {
+            'jsonrpc': '2.0',
+            'error': {
+                'code': -32603,
+                'message': f'Internal error: {str(e)}'
+            }
+        }
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser once; main() may run many times in tests"""
     parser = argparse.ArgumentParser(
         description='HoloScript-Narupa Bridge - JSON-RPC server for Narupa integration'
     )
@@ -307,15 +935,47 @@ def main():
         default='INFO',
         help='Logging level'
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        '--max-servers',
+        type=int,
+        default=DEFAULT_MAX_SERVERS,
+        help='Maximum number of concurrently running Narupa servers'
+    )
+    parser.add_argument(
+        '--framing',
+        choices=list(FRAMINGS),
+        default='ndjson',
+        help='Message framing on stdin/stdout: ndjson (one message per line) '
+             'or content-length (LSP-style headers)'
+    )
+    parser.add_argument(
+        '--max-request-bytes',
+        type=int,
+        default=DEFAULT_MAX_REQUEST_BYTES,
+        help='Reject JSON-RPC messages larger than this many bytes'
+    )
+    parser.add_argument(
+        '--unbuffered',
+        action='store_true',
+        help='Flush stdout after every response (interactive use)'
+    )
+    return parser
+
+
+def main() -> None:
+    """
+    Main entry point for stdin/stdout JSON-RPC communication
+    Reads JSON-RPC requests from stdin, processes them, writes responses to stdout
+    """
+    args = _build_parser().parse_args()
 
     # Update log level
     logger.setLevel(getattr(logging, args.log_level))
 
-    bridge = NarupaBridge()
+    bridge = NarupaBridge(max_servers=args.max_servers)
 
     # Setup signal handlers for graceful shutdown
-    def signal_handler(sig, frame):
+    def signal_handler(sig: int, frame: Any) -> None:
         logger.info("Received shutdown signal")
         bridge.shutdown_all()
         sys.exit(0)
@@ -330,10 +990,7 @@ def main():
             'version': '1.0.0',
             'narupa_available': bridge.narupa_available,
             'python_version': sys.version,
-            'supported_methods': [
-                'start_server', 'stop_server', 'get_status',
-                'list_servers', 'shutdown_all', 'ping'
-            ]
+            'supported_methods': list(bridge._dispatch)
         }
         print(json.dumps(test_result, indent=2))
         return
@@ -341,35 +998,90 @@ def main():
     # RPC mode: JSON-RPC loop on stdin/stdout
     logger.info("Narupa Bridge ready for JSON-RPC requests")
 
-    for line in sys.stdin:
-        try:
-            line = line.strip()
-            if not line:
-                continue
+    # Responses are buffered and flushed once a burst of requests has drained
+    out = io.BufferedWriter(sys.stdout.buffer, buffer_size=65536)
+    stdin = cast(io.FileIO, cast(io.BufferedReader, sys.stdin.buffer).raw)
+    framing = FRAMINGS[args.framing](args.max_request_bytes)
 
-            request = json.loads(line)
-            response = handle_rpc_request(bridge, request)
-            print(json.dumps(response), flush=True)
+    def write_response(response: Optional[Dict[str, Any]]) -> None:
+        if response is None:
+            return
+        out.write(framing.frame(_encode_response(response)))
+        if args.unbuffered:
+            out.flush()
 
-        except json.JSONDecodeError as e:
-            error_response = {
+    def handle_message(message: Optional[bytes]) -> None:
+        if message is None:
+            write_response({
                 'jsonrpc': '2.0',
                 'error': {
-                    'code': -32700,
-                    'message': f'Parse error: {str(e)}'
+                    'code': -32600,
+                    'message': f'Invalid Request: message exceeds {args.max_request_bytes} bytes'
                 }
-            }
-            print(json.dumps(error_response), flush=True)
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            error_response = {
-                'jsonrpc': '2.0',
-                'error': {
-                    'code': -32603,
-                    'message': f'Internal error: {str(e)}'
-                }
-            }
-            print(json.dumps(error_response), flush=True)
+            })
+        else:
+            write_response(handle_rpc_line(bridge, message))
+
+    # stdin is switched to non-blocking mode and watched with a selector, so
+    # each wakeup drains every request already in the pipe before the
+    # responses are flushed together. Where stdin cannot be polled (pipes on
+    # Windows, regular files under epoll) it falls back to one blocking read
+    # per burst. So does a terminal: its stdin, stdout and stderr usually
+    # share one open file description, and making it non-blocking would make
+    # response and log writes fail with BlockingIOError.
+    fd = stdin.fileno()
+    selector: Optional[selectors.BaseSelector] = None
+    if sys.platform != 'win32' and not os.isatty(fd):
+        selector = selectors.DefaultSelector()
+        try:
+            selector.register(fd, selectors.EVENT_READ)
+            os.set_blocking(fd, False)
+        except (OSError, ValueError):
+            selector.close()
+            selector = None
+
+    # Requests are read straight into a growable buffer and every complete
+    # message is split out in place
+    buf = bytearray(INITIAL_READ_BUFFER_SIZE)
+    used = 0
+    eof = False
+    try:
+        while not eof:
+            if selector is not None:
+                selector.select()
+
+            while True:
+                if used == len(buf):
+                    buf.extend(bytes(len(buf)))
+                with memoryview(buf) as view:
+                    n = stdin.readinto(view[used:])
+                if n is None:
+                    # Pipe drained
+                    break
+                if n == 0:
+                    eof = True
+                    break
+                used += n
+
+                messages, consumed = framing.split(buf, used)
+                if consumed:
+                    buf[:used - consumed] = buf[consumed:used]
+                    used -= consumed
+                for message in messages:
+                    handle_message(message)
+
+                if selector is None:
+                    break
+
+            out.flush()
+
+        for message in framing.finish(buf, used):
+            handle_message(message)
+    finally:
+        out.flush()
+        if selector is not None:
+            selector.close()
+            os.set_blocking(fd, True)
 
 
 if __name__ == '__main__':
@@ -15,6 +15,65 @@ interface PendingRequest {
   timeout: NodeJS.Timeout;
 }
 
+/**
+ * Incremental parser for Content-Length framed JSON-RPC messages
+ * (LSP-style 'Content-Length: N' header block, blank line, N bytes of JSON)
+ */
+export class ContentLengthParser {
+  private buffer = Buffer.alloc(0);
+
+  /**
+   * @param onInvalidHeader Called with each header block that has no valid
+   *   Content-Length; the block is skipped and parsing resumes after it
+   */
+  constructor(private onInvalidHeader: (header: string) => void = () => {}) {}
+
+  /**
+   * Encode a JSON-RPC message with its Content-Length header
+   * @param message Message to send
+   */
+  static frame(message: unknown): Buffer {
+    const body = Buffer.from(JSON.stringify(message), 'utf8');
+    const header = Buffer.from(`Content-Length: ${body.length}\r\n\r\n`, 'ascii');
+    return Buffer.concat([header, body]);
+  }
+
+  /**
+   * Append a chunk of output and return the message bodies it completes
+   * @param data Chunk read from the bridge's stdout
+   */
+  push(data: Buffer): string[] {
+    this.buffer = Buffer.concat([this.buffer, data]);
+    const bodies: string[] = [];
+
+    while (true) {
+      const headerEnd = this.buffer.indexOf('\r\n\r\n');
+      if (headerEnd === -1) {
+        break;
+      }
+
+      const header = this.buffer.subarray(0, headerEnd).toString('ascii');
+      const match = /^Content-Length:\s*(\d+)\s*$/im.exec(header);
+      const bodyStart = headerEnd + 4;
+      if (!match) {
+        this.onInvalidHeader(header);
+        this.buffer = this.buffer.subarray(bodyStart);
+        continue;
+      }
+
+      const bodyEnd = bodyStart + parseInt(match[1], 10);
+      if (this.buffer.length < bodyEnd) {
+        break;
+      }
+
+      bodies.push(this.buffer.subarray(bodyStart, bodyEnd).toString('utf8'));
+      this.buffer = this.buffer.subarray(bodyEnd);
+    }
+
+    return bodies;
+  }
+}
+
 export class NarupaProcessManager extends EventEmitter {
   private bridgeProcess: ChildProcess | null = null;
   private servers: Map<number, NarupaServerStatus> = new Map();
@@ -50,25 +109,23 @@ export class NarupaProcessManager extends EventEmitter {
     return new Promise((resolve, reject) => {
       try {
         // Spawn Python bridge process
-        this.bridgeProcess = spawn(this.pythonPath, [this.bridgePath, '--mode', 'rpc'], {
-          stdio: ['pipe', 'pipe', 'pipe']
+        this.bridgeProcess = spawn(
+          this.pythonPath,
+          [this.bridgePath, '--mode', 'rpc', '--framing', 'content-length'],
+          { stdio: ['pipe', 'pipe', 'pipe'] }
+        );
+
+        // Setup stdout handler for Content-Length framed JSON-RPC responses
+        const parser = new ContentLengthParser((header) => {
+          this.emit('error', new Error(`Invalid JSON-RPC header: ${header}`));
         });
-
-        // Setup stdout handler for JSON-RPC responses
-        let buffer = '';
         this.bridgeProcess.stdout?.on('data', (data: Buffer) => {
-          buffer += data.toString();
-          const lines = buffer.split('\n');
-          buffer = lines.pop() || '';
-
-          for (const line of lines) {
-            if (line.trim()) {
-              try {
-                const response = JSON.parse(line);
-                this.handleRpcResponse(response);
-              } catch (err) {
-                this.emit('error', new Error(`Failed to parse JSON-RPC response: ${err}`));
-              }
+          for (const body of parser.push(data)) {
+            try {
+              const response = JSON.parse(body);
+              this.handleRpcResponse(response);
+            } catch (err) {
+              this.emit('error', new Error(`Failed to parse JSON-RPC response: ${err}`));
             }
           }
         });
@@ -148,8 +205,7 @@ export class NarupaProcessManager extends EventEmitter {
 
       // Send request
       try {
-        const requestStr = JSON.stringify(request) + '\n';
-        this.bridgeProcess.stdin.write(requestStr);
+        this.bridgeProcess.stdin.write(ContentLengthParser.frame(request));
       } catch (err) {
         this.pendingRequests.delete(id);
         clearTimeout(timeoutHandle);
@@ -199,7 +255,8 @@ export class NarupaProcessManager extends EventEmitter {
       md_engine: config.mdEngine || 'openmm',
       temperature: config.temperature || 300,
       timestep: config.timestep || 2.0,
-      steps: config.steps
+      steps: config.steps,
+      batch_steps: config.batchSteps
     };
 
     try {
@@ -19,6 +19,8 @@ export interface NarupaServerConfig {
   timestep: number;
   /** Number of simulation steps */
   steps?: number;
+  /** MD steps run per published frame (default: 1000) */
+  batchSteps?: number;
 }
 
 /**
@@ -0,0 +1,89 @@
+/**
+ * Tests for Content-Length framing of bridge JSON-RPC messages
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import { spawn } from 'child_process';
+import * as path from 'path';
+import { ContentLengthParser } from '../src/narupa-process-manager';
+
+const frame = (body: string): Buffer =>
+  Buffer.concat([Buffer.from(`Content-Length: ${Buffer.byteLength(body)}\r\n\r\n`), Buffer.from(body)]);
+
+describe('ContentLengthParser', () => {
+  it('should parse a message split across reads', () => {
+    const parser = new ContentLengthParser();
+    const data = frame('{"id":1,"result":{}}');
+
+    expect(parser.push(data.subarray(0, 7))).toEqual([]);
+    expect(parser.push(data.subarray(7, 25))).toEqual([]);
+    expect(parser.push(data.subarray(25))).toEqual(['{"id":1,"result":{}}']);
+  });
+
+  it('should count Content-Length in bytes across a split UTF-8 character', () => {
+    const parser = new ContentLengthParser();
+    const body = '{"id":1,"result":"Å"}';
+    const data = frame(body);
+    const split = data.indexOf(0xc3) + 1;
+
+    expect(parser.push(data.subarray(0, split))).toEqual([]);
+    expect(parser.push(data.subarray(split))).toEqual([body]);
+  });
+
+  it('should parse several messages from one read', () => {
+    const parser = new ContentLengthParser();
+    const data = Buffer.concat([frame('{"id":1}'), frame('{"id":2}'), frame('{"id":3}').subarray(0, 5)]);
+
+    expect(parser.push(data)).toEqual(['{"id":1}', '{"id":2}']);
+    expect(parser.push(frame('{"id":3}').subarray(5))).toEqual(['{"id":3}']);
+  });
+
+  it('should skip a header block without Content-Length and resync', () => {
+    const invalid: string[] = [];
+    const parser = new ContentLengthParser((header) => invalid.push(header));
+    const data = Buffer.concat([Buffer.from('Content-Type: application/json\r\n\r\n'), frame('{"id":4}')]);
+
+    expect(parser.push(data)).toEqual(['{"id":4}']);
+    expect(invalid).toEqual(['Content-Type: application/json']);
+  });
+
+  it('should frame messages it can parse back', () => {
+    const parser = new ContentLengthParser();
+    const message = { jsonrpc: '2.0', id: 5, method: 'ping', params: { note: 'ü' } };
+
+    expect(parser.push(ContentLengthParser.frame(message)).map((body) => JSON.parse(body))).toEqual([message]);
+  });
+
+  it('should exchange framed messages with the Python bridge', async () => {
+    const bridge = spawn('python', [
+      path.join(__dirname, '../python/holoscript_narupa_bridge.py'),
+      '--mode', 'rpc', '--framing', 'content-length'
+    ]);
+    const parser = new ContentLengthParser();
+    const responses: any[] = [];
+    const done = new Promise<void>((resolve) => {
+      bridge.stdout.on('data', (data: Buffer) => {
+        responses.push(...parser.push(data).map((body) => JSON.parse(body)));
+        if (responses.length === 3) {
+          resolve();
+        }
+      });
+    });
+
+    // Two requests in one write, then a third split across writes
+    bridge.stdin.write(Buffer.concat([
+      ContentLengthParser.frame({ jsonrpc: '2.0', id: 1, method: 'ping', params: {} }),
+      ContentLengthParser.frame({ jsonrpc: '2.0', id: 2, method: 'list_servers', params: {} })
+    ]));
+    const third = ContentLengthParser.frame({ jsonrpc: '2.0', id: 3, method: 'no_such_method', params: {} });
+    bridge.stdin.write(third.subarray(0, 10));
+    bridge.stdin.write(third.subarray(10));
+
+    await done;
+    bridge.stdin.end();
+
+    expect(responses.map((response) => response.id)).toEqual([1, 2, 3]);
+    expect(responses[0].result.status).toBe('pong');
+    expect(responses[2].error.code).toBe(-32601);
+  }, 10000);
+});
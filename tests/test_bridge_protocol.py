@@ -0,0 +1,295 @@
+"""
+Tests for the bridge's JSON-RPC framing, stdin read loop, request decoding and response cache
+"""
+
+import concurrent.futures
+import importlib
+import json
+import os
+import select
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+BRIDGE = Path(__file__).resolve().parents[1] / 'python' / 'holoscript_narupa_bridge.py'
+
+sys.path.insert(0, str(BRIDGE.parent))
+
+
+@pytest.fixture(scope='module')
+def hb(tmp_path_factory):
+    """The bridge module, imported where its log file can be written"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('bridge'))
+    try:
+        return importlib.import_module('holoscript_narupa_bridge')
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture(params=['msgspec', 'fallback'])
+def decoder(request, hb, monkeypatch):
+    """Run a test with the msgspec decoder and with the plain JSON fallback"""
+    if request.param == 'msgspec':
+        if hb.msgspec is None:
+            pytest.skip('msgspec not installed')
+    else:
+        monkeypatch.setattr(hb, 'msgspec', None)
+    return hb._decode_request
+
+
+@pytest.fixture
+def bridge(hb):
+    """A bridge with the Narupa SDK treated as unavailable"""
+    bridge = hb.NarupaBridge()
+    bridge.narupa_available = False
+    yield bridge
+    bridge._loop.call_soon_threadsafe(bridge._loop.stop)
+
+
+def split_all(framing, chunks):
+    """Feed chunks through a framing as successive reads; return all messages"""
+    buf = bytearray()
+    messages = []
+    for chunk in chunks:
+        buf += chunk
+        found, consumed = framing.split(buf, len(buf))
+        del buf[:consumed]
+        messages.extend(found)
+    return messages + framing.finish(buf, len(buf))
+
+
+def content_length(body):
+    return b'Content-Length: %d\r\n\r\n' % len(body) + body
+
+
+def run_bridge(tmp_path, requests, *args):
+    """Pipe NDJSON requests through a bridge process; return its responses"""
+    result = subprocess.run(
+        [sys.executable, str(BRIDGE), *args],
+        input=b''.join(requests), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        cwd=tmp_path, timeout=30
+    )
+    assert result.returncode == 0
+    return [json.loads(line) for line in result.stdout.splitlines()]
+
+
+def request(req_id, method, **params):
+    return json.dumps({'jsonrpc': '2.0', 'id': req_id, 'method': method, 'params': params}).encode() + b'\n'
+
+
+class TestNdjsonFraming:
+
+    def test_message_split_across_reads(self, hb):
+        framing = hb._NdjsonFraming(1024)
+        assert split_all(framing, [b'{"id":', b'1}', b'\n']) == [b'{"id":1}']
+
+    def test_several_messages_per_read(self, hb):
+        framing = hb._NdjsonFraming(1024)
+        assert split_all(framing, [b'{"id":1}\n{"id":2}\n{"id"', b':3}\n']) == [
+            b'{"id":1}', b'{"id":2}', b'{"id":3}'
+        ]
+
+    def test_final_line_without_newline(self, hb):
+        framing = hb._NdjsonFraming(1024)
+        assert split_all(framing, [b'{"id":1}\n{"id":2}']) == [b'{"id":1}', b'{"id":2}']
+
+    def test_oversized_message_is_skipped_and_stream_resyncs(self, hb):
+        framing = hb._NdjsonFraming(16)
+        chunks = [b'{"id":1}\n', b'x' * 20, b'x' * 20, b'\n{"id":2}\n']
+        assert split_all(framing, chunks) == [b'{"id":1}', None, b'{"id":2}']
+
+
+class TestContentLengthFraming:
+
+    def test_message_split_across_reads(self, hb):
+        framing = hb._ContentLengthFraming(1024)
+        data = content_length(b'{"id":1}')
+        chunks = [data[:5], data[5:18], data[18:22], data[22:]]
+        assert split_all(framing, chunks) == [b'{"id":1}']
+
+    def test_several_messages_per_read(self, hb):
+        framing = hb._ContentLengthFraming(1024)
+        data = content_length(b'{"id":1}') + content_length(b'{"id":2}')
+        third = content_length(b'{"id":3}')
+        assert split_all(framing, [data + third[:4], third[4:]]) == [
+            b'{"id":1}', b'{"id":2}', b'{"id":3}'
+        ]
+
+    def test_oversized_message_is_skipped_and_stream_resyncs(self, hb):
+        framing = hb._ContentLengthFraming(16)
+        big = content_length(b'x' * 40)
+        chunks = [big[:30], big[30:], content_length(b'{"id":2}')]
+        assert split_all(framing, chunks) == [None, b'{"id":2}']
+
+    def test_header_without_content_length_is_skipped(self, hb):
+        framing = hb._ContentLengthFraming(1024)
+        data = b'Content-Type: application/json\r\n\r\n' + content_length(b'{"id":2}')
+        assert split_all(framing, [data]) == [b'{"id":2}']
+
+    def test_partial_message_at_eof_is_dropped(self, hb):
+        framing = hb._ContentLengthFraming(1024)
+        assert split_all(framing, [content_length(b'{"id":1}')[:-1]]) == []
+
+    def test_frame_round_trip(self, hb):
+        framing = hb._ContentLengthFraming(1024)
+        assert split_all(framing, [framing.frame(b'{"id":1}')]) == [b'{"id":1}']
+
+
+class TestReadLoop:
+
+    def test_messages_larger_than_the_read_buffer(self, hb, tmp_path):
+        padding = 'x' * (hb.INITIAL_READ_BUFFER_SIZE * 3)
+        responses = run_bridge(tmp_path, [request(1, 'ping'), request(2, 'ping', padding=padding), request(3, 'ping')])
+
+        assert [response['id'] for response in responses] == [1, 2, 3]
+        assert all(response['result']['status'] == 'pong' for response in responses)
+
+    def test_burst_is_answered_before_stdin_closes(self, tmp_path):
+        bridge = subprocess.Popen(
+            [sys.executable, str(BRIDGE)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=tmp_path
+        )
+        try:
+            bridge.stdin.write(request(1, 'ping') + request(2, 'list_servers') + request(3, 'ping'))
+            bridge.stdin.flush()
+
+            output = b''
+            while output.count(b'\n') < 3:
+                ready, _, _ = select.select([bridge.stdout], [], [], 10)
+                assert ready, 'responses were not flushed while stdin stayed open'
+                output += os.read(bridge.stdout.fileno(), 65536)
+        finally:
+            bridge.stdin.close()
+            bridge.wait(timeout=10)
+
+        assert [json.loads(line)['id'] for line in output.splitlines()] == [1, 2, 3]
+        assert bridge.returncode == 0
+
+    def test_oversized_message_is_rejected_and_stream_resyncs(self, tmp_path):
+        requests = [request(1, 'ping'), request(2, 'ping', padding='x' * 5000), request(3, 'list_servers')]
+        responses = run_bridge(tmp_path, requests, '--max-request-bytes', '1000')
+
+        assert [response.get('id') for response in responses] == [1, None, 3]
+        assert responses[1]['error']['code'] == -32600
+        assert responses[2]['result'] == {'status': 'success', 'servers': []}
+
+
+class TestDecodeRequest:
+
+    def test_named_params(self, decoder):
+        assert decoder(b'{"jsonrpc":"2.0","method":"get_status","params":{"server_id":1},"id":3}') == (
+            'get_status', {'server_id': 1}, 3
+        )
+
+    def test_positional_params_and_float_id(self, decoder):
+        assert decoder(b'{"jsonrpc":"2.0","method":"ping","params":[],"id":1.5}') == ('ping', [], 1.5)
+
+    def test_missing_params_and_id(self, decoder):
+        assert decoder(b'{"method":"ping"}') == ('ping', {}, None)
+
+    def test_parse_error(self, hb, decoder):
+        with pytest.raises(hb._RpcError) as exc_info:
+            decoder(b'{"method":')
+        assert exc_info.value.code == -32700
+        assert exc_info.value.req_id is None
+
+    def test_invalid_request_keeps_id(self, hb, decoder):
+        with pytest.raises(hb._RpcError) as exc_info:
+            decoder(b'{"method":5,"id":"abc"}')
+        assert exc_info.value.code == -32600
+        assert exc_info.value.req_id == 'abc'
+
+    def test_invalid_request_response_echoes_id(self, hb, bridge, decoder):
+        response = hb.handle_rpc_line(bridge, b'{"method":"ping","params":"x","id":9}')
+        assert response['id'] == 9
+        assert response['error']['code'] == -32600
+
+    @pytest.mark.parametrize('line', [
+        b'{"method":"ping","id":123456789012345678901234567890}',
+        b'{"method":"ping","id":1e400}',
+    ])
+    def test_out_of_range_id_is_never_echoed_unencodable(self, hb, decoder, line):
+        try:
+            _, _, req_id = decoder(line)
+        except hb._RpcError as e:
+            req_id = e.req_id
+        hb._json_dumps({'id': req_id})
+
+    def test_unencodable_result_becomes_internal_error(self, hb):
+        response = json.loads(hb._encode_response({'jsonrpc': '2.0', 'id': 4, 'result': {'value': object()}}))
+        assert response['id'] == 4
+        assert response['error']['code'] == -32603
+
+    def test_bridge_survives_out_of_range_integers(self, tmp_path):
+        requests = [
+            b'{"jsonrpc":"2.0","method":"ping","id":123456789012345678901234567890}\n',
+            b'{"jsonrpc":"2.0","method":"get_status","params":{"server_id":123456789012345678901234567890},"id":2}\n',
+            request(3, 'ping'),
+        ]
+        responses = run_bridge(tmp_path, requests)
+
+        assert len(responses) == 3
+        assert responses[1]['id'] == 2
+        assert responses[2] == {'jsonrpc': '2.0', 'id': 3, 'result': {'status': 'pong', 'version': '1.0.0'}}
+
+
+class TestResponseCache:
+
+    @pytest.fixture
+    def counted(self, bridge):
+        """Count calls to the list_servers handler"""
+        calls = []
+        handler = bridge._dispatch['list_servers']
+
+        def counting(params):
+            calls.append(params)
+            return handler(params)
+
+        bridge._dispatch['list_servers'] = counting
+        return calls
+
+    @pytest.fixture
+    def clock(self, hb, monkeypatch):
+        """Replace the monotonic clock with one the test advances"""
+        now = [1000.0]
+        monkeypatch.setattr(hb.time, 'monotonic', lambda: now[0])
+        return now
+
+    def test_result_reused_within_ttl(self, hb, bridge, counted, clock):
+        first = hb.handle_rpc_request(bridge, 'list_servers', {}, 1)
+        clock[0] += hb.RESPONSE_CACHE_TTL / 2
+        second = hb.handle_rpc_request(bridge, 'list_servers', {}, 2)
+
+        assert len(counted) == 1
+        assert second['result'] == first['result']
+        assert second['id'] == 2
+
+    def test_result_recomputed_after_ttl(self, hb, bridge, counted, clock):
+        hb.handle_rpc_request(bridge, 'list_servers', {}, 1)
+        clock[0] += hb.RESPONSE_CACHE_TTL + 0.001
+        hb.handle_rpc_request(bridge, 'list_servers', {}, 2)
+
+        assert len(counted) == 2
+
+    def test_params_are_part_of_the_key(self, hb, bridge, counted, clock):
+        hb.handle_rpc_request(bridge, 'list_servers', {}, 1)
+        hb.handle_rpc_request(bridge, 'list_servers', [], 2)
+        hb.handle_rpc_request(bridge, 'list_servers', {'verbose': True}, 3)
+
+        assert len(counted) == 3
+
+    def test_stop_server_invalidates(self, hb, bridge, counted, clock):
+        bridge.servers[38801] = {'port': 38801, 'num_atoms': 3, 'config': {}, 'stop': threading.Event()}
+        bridge.server_tasks[38801] = concurrent.futures.Future()
+
+        before = hb.handle_rpc_request(bridge, 'list_servers', {}, 1)
+        hb.handle_rpc_request(bridge, 'stop_server', {'server_id': 38801}, 2)
+        after = hb.handle_rpc_request(bridge, 'list_servers', {}, 3)
+
+        assert len(counted) == 2
+        assert len(before['result']['servers']) == 1
+        assert after['result']['servers'] == []